@@ -9,7 +9,7 @@ from tensorflow.keras.models import Sequential
 # Auto-encoding function
 def autoEncode(data, catColumns = [], numColumns = [], 
                nFeatures = 5, minSize = 1, nEpochs=100, 
-               deleteOld = True, verbose = False) :
+               deleteOld = True, verbose = False, scaler = None) :
     """
     data: Dataset that dimension reduction ought to be performed on
     catColumns: List of categorical column names that are to be autoencoded
@@ -18,20 +18,32 @@ def autoEncode(data, catColumns = [], numColumns = [],
     minSize: Minimum size of a category not to be lumped into the "Other" category (increase this to reduce running time at the cost of performance)
     nEpochs: Number of epochs that the autoencoder performs (increase this to get better performance but also longer running time)
     deleteOld: Delete columns for which data reduction has been performed (True = Delete, False = Do not delete)
+    scaler: Optional Standardizer for <numColumns>, applied to the numerical input of the autoencoder only (fitted first if needed)
+            Its columns must be the same as <numColumns>, and it must not already have been applied to <data> (e.g. by getData)
     """
     
-    # Create copy of data to prevent unintentional overwrites
-    data = data.copy()
+    # Copy only the categorical columns to prevent unintentional overwrites, the (possibly wide) numerical part is not copied
+    dataCat = data[catColumns].copy()
     
     # Set less frequent categories to "other" to reduce running time (if <minSize> is high enough)
     for category in catColumns :
-        counts = data[category].value_counts()
-        data.loc[data[category].isin(counts[counts < minSize].index), category] = "Other"
+        counts = dataCat[category].value_counts()
+        dataCat.loc[dataCat[category].isin(counts[counts < minSize].index), category] = "Other"
         
     # One-hot encoding
     OHenc = OneHotEncoder() 
-    dataCategorical = OHenc.fit_transform(data[catColumns]).toarray()
-    dataNumerical = data[numColumns].to_numpy()
+    dataCategorical = OHenc.fit_transform(dataCat).toarray()
+    dataNumerical = data[numColumns].to_numpy(dtype=np.float64)
+    
+    # Standardize the numerical input in place, in batches of rows
+    if scaler is not None :
+        if scaler.columns is None :
+            scaler.columns = list(numColumns)
+        if set(scaler.columns) != set(numColumns) :
+            raise ValueError("Standardizer columns {} differ from numColumns {}".format(scaler.columns, numColumns))
+        if scaler.mean is None :
+            scaler.fit(data[scaler.columns])
+        scaler.transformArray(dataNumerical, numColumns)
     reducableData = np.concatenate((dataCategorical, dataNumerical), axis=1)
     
     # Encoder
@@ -64,8 +76,11 @@ def autoEncode(data, catColumns = [], numColumns = [],
     # Putting everything ino a new dataframe & then adding it back to the original data
     reducedColumnsFrame = pd.DataFrame(encoded_nFeatures, columns = ["cat"+str(i) for i in range(1,nFeatures+1)])
     if deleteOld == True :
-        data.drop(columns=catColumns+numColumns, inplace=True)
-    data.reset_index(inplace=True, drop=True)
+        data = data.drop(columns=catColumns+numColumns)
+    else :
+        data = data.copy()
+        data[catColumns] = dataCat
+    data = data.reset_index(drop=True)
     data = pd.concat([data, reducedColumnsFrame], axis=1)
     
     # Return result
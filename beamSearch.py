@@ -1,6 +1,6 @@
 """
 The following code was adapted from W. Duivesteijn, T.C. van Dijk. (2021)
-    Exceptional Gestalt Mining: Combining Magic Cards to Make Complex Coalitions Thrive. 
+    Exceptional Gestalt Mining: Combining Magic Cards to Make Complex Coalitions Thrive.
     In: Proceedings of the 8th Workshop on Machine Learning and Data Mining for Sports Analytics.
     Available from http://wwwis.win.tue.nl/~wouter/Publ/J05-EMM_DMKD.pdf
 """
@@ -8,24 +8,112 @@ The following code was adapted from W. Duivesteijn, T.C. van Dijk. (2021)
 # Package imports
 import heapq
 import numpy as np
+import pandas as pd
+
+# Operators a selector can use, selectors refer to them by their index
+# The first two are used for numerical features, the last two for categorical features
+OPERATORS = ('<=', '>', '==', '!=')
 
 # Classes
+class SelectorTable:
+    """
+    Used to intern selectors as (feature id, operator id, value id) triples
+    Descriptions are sorted tuples of selector ids, strings are only rendered at output time
+    Numerical thresholds and categorical values are kept in separate value tables
+    Categorical values are interned per feature and type, so that e.g. 1, 1.0 and True are never confused
+    """
+
+    def __init__(self):
+        # Initializes empty feature, value and selector tables
+        self.features = []
+        self.num_values = []
+        self.cat_values = []
+        self.selectors = []
+        self.feature_ids = {}
+        self.num_ids = {}
+        self.cat_ids = {}
+        self.selector_ids = {}
+
+    def intern(self, feature, op, value):
+        # Returns the id of selector <feature> <OPERATORS[op]> <value>, adding it to the table if needed
+        fid = self.feature_ids.get(feature)
+        if fid is None:
+            fid = self.feature_ids[feature] = len(self.features)
+            self.features.append(feature)
+        if op < 2:
+            values, ids, value_key = self.num_values, self.num_ids, value
+        else:
+            values, ids, value_key = self.cat_values, self.cat_ids, (fid, type(value), value)
+        vid = ids.get(value_key)
+        if vid is None:
+            vid = ids[value_key] = len(values)
+            values.append(value)
+        key = (fid, op, vid)
+        sid = self.selector_ids.get(key)
+        if sid is None:
+            sid = self.selector_ids[key] = len(self.selectors)
+            self.selectors.append(key)
+        return sid
+
+    def render(self, sid):
+        # Returns selector <sid> in the string format understood by DataFrame.eval
+        fid, op, vid = self.selectors[sid]
+        if op < 2:
+            return "{} {} {}".format(self.features[fid], OPERATORS[op], self.num_values[vid])
+        return "{} {} '{}'".format(self.features[fid], OPERATORS[op], self.cat_values[vid])
+
+    def render_desc(self, desc):
+        # Returns description <desc> as a list of selector strings
+        return [self.render(sid) for sid in desc]
+
+    def mask(self, sid, columns):
+        # Returns a boolean array indicating which rows satisfy selector <sid>
+        # <columns> maps feature names to the numpy arrays of their column
+        fid, op, vid = self.selectors[sid]
+        column = columns[self.features[fid]]
+        if op == 0:
+            return column <= self.num_values[vid]
+        elif op == 1:
+            return column > self.num_values[vid]
+        elif op == 2:
+            return column == self.cat_values[vid]
+        else:
+            return column != self.cat_values[vid]
+
+class Entry:
+    """
+    Used to store a single entry of the bounded priority queue
+    Entries are ordered by quality, ties are broken on insertion order
+    """
+    __slots__ = ('quality', 'count', 'element', 'adds')
+
+    def __init__(self, quality, count, element, adds):
+        self.quality = quality
+        self.count = count
+        self.element = element
+        self.adds = adds
+
+    def __lt__(self, other):
+        return (self.quality, self.count) < (other.quality, other.count)
+
 class BoundedPriorityQueue:
     """
     Used to store the <q> most promising subgroups
     Ensures uniqness
     Keeps a maximum size (throws away value with least quality)
+    When a <table> is given, elements are descriptions of selector ids which are rendered as strings on output
     """
 
-    def __init__(self, bound): 
+    def __init__(self, bound, table=None):
         # Initializes empty queue with maximum length of <bound>
         self.values = []
         self.bound = bound
         self.entry_count = 0
+        self.table = table
 
-    def add(self, element, quality, **adds): 
+    def add(self, element, quality, **adds):
         # Adds <element> to the bounded priority queue if it is of sufficient quality
-        new_entry = (quality, self.entry_count, element, adds)
+        new_entry = Entry(quality, self.entry_count, element, adds or None)
         if (len(self.values) >= self.bound):
             heapq.heappushpop(self.values, new_entry)
         else:
@@ -33,16 +121,22 @@ class BoundedPriorityQueue:
 
         self.entry_count += 1
 
+    def get_ids(self):
+        # Returns (quality, element) pairs in sorted order without rendering the elements
+        for entry in sorted(self.values, reverse=True):
+            yield (entry.quality, entry.element)
+
     def get_values(self):
         # Returns elements in bounded priority queue in sorted order
-        for (q, _, e, x) in sorted(self.values, reverse=True):
-            yield (q, e, x)
+        for entry in sorted(self.values, reverse=True):
+            e = entry.element if self.table is None else self.table.render_desc(entry.element)
+            yield (entry.quality, e, dict(entry.adds or {}))
 
-    def show_contents(self):  
+    def show_contents(self):
         # Prints contents of the bounded priority queue (used for debugging)
         print("show_contents")
-        for (q, entry_count, e) in self.values:
-            print(q, entry_count, e)
+        for entry in self.values:
+            print(entry.quality, entry.count, entry.element)
 
 class Queue:
     """
@@ -52,16 +146,20 @@ class Queue:
 
     def __init__(self): # Initializes empty queue
         self.items = []
+        self.seen = set()
 
     def is_empty(self): # Returns True if queue is empty, False otherwise
         return self.items == []
 
     def enqueue(self, item): # Adds <item> to queue if it is not already present
-        if item not in self.items:
+        if item not in self.seen:
+            self.seen.add(item)
             self.items.insert(0, item)
 
     def dequeue(self): # Pulls one item from the queue
-        return self.items.pop()
+        item = self.items.pop()
+        self.seen.discard(item)
+        return item
 
     def size(self): # Returns the number of items in the queue
         return len(self.items)
@@ -75,139 +173,126 @@ class Queue:
 
     def clear(self): # Removes all items from the queue
         self.items.clear()
-        
+        self.seen.clear()
+
 # Functions
 def refine(desc, more):
-    # Creates a copy of the seed <desc> and adds it to the new selector <more>
-    # Used to prevent pointer issues with selectors
-    copy = desc[:]
-    copy.append(more)
-    return copy
+    # Creates a new description from the seed <desc> and the new selector id <more>
+    # Descriptions are sorted tuples, so the same set of selectors always gives the same description
+    return tuple(sorted(desc + (more,)))
 
-def as_string(desc):
+def as_string(desc, table=None):
     # Adds ' and ' to <desc> such that selectors are properly separated when the refine function is used
+    # If a <table> is given, <desc> is a description of selector ids which are rendered first
+    if table is not None:
+        desc = table.render_desc(desc)
     return ' and '.join(desc)
 
-def eta(seed, df, features, n_chunks = 5):
-    # Returns a generator which includes all possible refinements of <seed> for the given <features> on dataset <df>
-    # n_chunks refers to the number of possible splits we consider for numerical features
-    
-    print("eta ", seed)
-    if seed != []:              #we only specify more on the elements that are still in the subset
-        d_str = as_string(seed)
-        ind = df.eval(d_str)
-        df_sub = df.loc[ind, ]
-    else:
-        df_sub = df
+def eta(seed, seed_mask, table, columns, features, n_chunks = 5):
+    # Returns a generator which includes all possible refinements of <seed> for the given <features>
+    # <seed_mask> indicates the rows covered by <seed>, <columns> maps features to their column arrays
+    # Yields (description, selector id) pairs, n_chunks refers to the number of possible splits we consider for numerical features
+
+    print("eta ", as_string(seed, table))
     for f in features:
-        if (df_sub[f].dtype == 'float64') or (df_sub[f].dtype == 'float32'): #get quantiles here instead of intervals for the case that data are very skewed
-            column_data = df_sub[f]
+        column_data = columns[f][seed_mask] #we only specify more on the elements that are still in the subset
+        if column_data.dtype.kind in 'fi': #get quantiles here instead of intervals for the case that data are very skewed
             dat = np.sort(column_data)
             dat = dat[np.logical_not(np.isnan(dat))]
             for i in range(1,n_chunks+1): #determine the number of chunks you want to divide your data in
                 x = np.percentile(dat,100/i) #
-                candidate = "{} <= {}".format(f, x)
-                if not candidate in seed: # if not already there
-                    yield refine(seed, candidate)
-                candidate = "{} > {}".format(f, x)
-                if not candidate in seed: # if not already there
-                    yield refine(seed, candidate)
-        elif (df_sub[f].dtype == 'object'):
-            column_data = df_sub[f]
-            uniq = column_data.dropna().unique()
-            for i in uniq:
-                candidate = "{} == '{}'".format(f, i)
-                if not candidate in seed: # if not already there
-                    yield refine(seed, candidate)
-                candidate = "{} != '{}'".format(f, i)
-                if not candidate in seed: # if not already there
-                    yield refine(seed, candidate)
-        elif (df_sub[f].dtype == 'int64'):
-            column_data = df_sub[f]
-            dat = np.sort(column_data)
-            dat = dat[np.logical_not(np.isnan(dat))]
-            for i in range(1,n_chunks+1): #determine the number of chunks you want to divide your data in
-                x = np.percentile(dat,100/i) #
-                candidate = "{} <= {}".format(f, x)
-                if not candidate in seed: # if not already there
-                    yield refine(seed, candidate)
-                candidate = "{} > {}".format(f, x)
-                if not candidate in seed: # if not already there
-                    yield refine(seed, candidate)
-        elif (df_sub[f].dtype == 'bool'):
-            uniq = column_data.dropna().unique()
-            for i in uniq:
-                candidate = "{} == '{}'".format(f, i)
-                if not candidate in seed: # if not already there
-                    yield refine(seed, candidate)
-                candidate = "{} != '{}'".format(f, i)
-                if not candidate in seed: # if not already there
-                    yield refine(seed, candidate)
+                for op in (0, 1):
+                    candidate = table.intern(f, op, x)
+                    if not candidate in seed: # if not already there
+                        yield refine(seed, candidate), candidate
         else:
-            assert False
-            
-def satisfies_all(desc, df, threshold=0.02):
-    # Function used to check if subgroup with pattern <desc> is sufficiently big relative to its dataset <df>
-    # A subgroup is sufficiently big if the proportion of data included in it exceeds <threshold>   
-    d_str = as_string(desc)
-    ind = df.eval(d_str)
-    return sum(ind) >= len(df) * 0.02 
-
-def eval_quality(desc, df, target):
-    # Function used to calculate the solution's WRAcc
-    sub_group = df[df.eval(as_string(desc))] 
-    prop_p_sg = len(sub_group[sub_group[target]==1])/len(sub_group)
-    prop_p_df = len(df[df[target]==1])/len(df)
-    wracc = ((len(sub_group)/len(df))**1) * (prop_p_sg - prop_p_df) #for WRAcc a=1
-    return wracc
+            uniq = pd.unique(column_data)
+            uniq = uniq[pd.notna(uniq)]
+            for i in uniq:
+                for op in (2, 3):
+                    candidate = table.intern(f, op, i)
+                    if not candidate in seed: # if not already there
+                        yield refine(seed, candidate), candidate
 
-def EMM(w, d, q, catch_all_description, df, features, target, n_chunks=5, ensure_diversity = False):
+def satisfies_all(size, n_rows, threshold=0.02):
+    # Function used to check if a subgroup of <size> rows is sufficiently big relative to its dataset of <n_rows> rows
+    # A subgroup is sufficiently big if the proportion of data included in it exceeds <threshold>
+    return size >= n_rows * threshold
+
+def eval_quality(mask, target_data):
+    # Function used to calculate the solution's WRAcc, <target_data> is the boolean array target == 1
+    return wracc(int(mask.sum()), np.count_nonzero(target_data[mask]), len(mask), np.count_nonzero(target_data))
+
+def wracc(size, positives, n_rows, n_positives):
+    # Function used to calculate the WRAcc of a subgroup from its (size, positives) counts and those of the dataset
+    prop_p_sg = positives/size
+    prop_p_df = n_positives/n_rows
+    wracc = ((size/n_rows)**1) * (prop_p_sg - prop_p_df) #for WRAcc a=1
+    return float(wracc)
+
+def desc_mask(desc, table, columns, n_rows):
+    # Returns the row mask of description <desc>, the empty description covers all rows
+    mask = np.ones(n_rows, dtype=bool)
+    for sid in desc:
+        mask &= table.mask(sid, columns)
+    return mask
+
+def expand(seed, table, columns, target_data, features, n_chunks, counts):
+    # Returns the list of (description, selector id) refinements generated by eta for <seed>
+    # The (size, positives) counts of refinements that are not in <counts> yet are added to it
+    seed_mask = desc_mask(seed, table, columns, len(target_data))
+    refinements = list(eta(seed, seed_mask, table, columns, features, n_chunks))
+    for desc, sid in refinements:
+        if desc not in counts:
+            mask = seed_mask & table.mask(sid, columns)
+            counts[desc] = (int(mask.sum()), int(np.count_nonzero(target_data[mask])))
+    return refinements
+
+def beam_search(w, d, q, catch_all_description, table, refinements, count, n_rows, n_positives, ensure_diversity = False):
     """
-    w - width of beam, i.e. the max number of results in the beam
-    d - num levels, i.e. how many attributes are considered
-    q - max results, i.e. max number of results output by the algorithm
-    eta - a function that receives a description and returns all possible refinements
-    satisfies_all - a function that receives a description and verifies wheather it satisfies some requirements as needed
-    eval_quality - returns a quality for a given description. This should be comparable to qualities of other descriptions
-    catch_all_description - the equivalent of True, or all, as that the whole dataset shall match
-    df - dataframe of mined dataset
-    features - features in scope
-    target - column name of target attribute in df
+    Runs the levels of the BeamSearch used by EMM and IncrementalEMM
+    refinements - a function that receives a seed and returns its (description, selector id) refinements
+    count - a function that receives a description and returns its (size, positives) counts
+    n_rows, n_positives - counts of the whole dataset
+    Other parameters are the same as for EMM
+    Returns the result set and the list of beam members of every level
     """
-    
+
     # Initialize variables
-    resultSet = BoundedPriorityQueue(q) # Set of results, can contain results from multiple levels
+    resultSet = BoundedPriorityQueue(q, table) # Set of results, can contain results from multiple levels
     candidateQueue = Queue() # Set of candidate solutions to consider adding to the ResultSet
-    candidateQueue.enqueue(catch_all_description) # Set of results on a particular level
+    candidateQueue.enqueue(tuple(catch_all_description)) # Set of results on a particular level
     error = 0.00001 # Allowed error margin (due to floating point error) when comparing the quality of solutions
+    beams = []
 
     # Perform BeamSearch for <d> levels
     for level in range(d):
         print("level : ", level)
-        
+
         # Initialize this level's beam
-        beam = BoundedPriorityQueue(w)
+        beam = BoundedPriorityQueue(w, table)
 
-        # Go over all rules generated on previous level, or 'empty' rule if level = 0 
+        # Go over all rules generated on previous level, or 'empty' rule if level = 0
         for seed in candidateQueue.get_values():
-            print("    seed : ", seed)
-            
+            print("    seed : ", table.render_desc(seed))
+
             # Start by evaluating the quality of the seed
-            if seed != []:
-                seed_quality = eval_quality(seed, df, target)
+            if seed != ():
+                seed_quality = wracc(*count(seed), n_rows, n_positives)
             else:
                 seed_quality = 99
 
             # For all refinements created by eta function on descriptions (i.e features), which can be different types of columns
             # eta(seed) reads the dataset given certain seed (i.e. already created rules) and looks at new descriptions
-            for desc in eta(seed, df, features, n_chunks):
+            for desc, sid in refinements(seed):
+                size, positives = count(desc)
 
                 # Check if the subgroup contains at least x% of data, proceed if yes
-                if satisfies_all(desc, df):
+                if satisfies_all(size, n_rows):
 
                     # Calculate the new solution's quality
-                    quality = eval_quality(desc, df, target)
-                    
+                    quality = wracc(size, positives, n_rows, n_positives)
+
                     # Ensure diversity by forcing difference in quality when compared to its seed
                     # if <ensure_diversity> is set to True. Principle is based on:
                     # Van Leeuwen, M., & Knobbe, A. (2012), Diverse subgroup set discovery.
@@ -220,10 +305,176 @@ def EMM(w, d, q, catch_all_description, df, features, target, n_chunks=5, ensure
                         resultSet.add(desc, quality)
                         beam.add(desc, quality)
 
-        # When all candidates for a search level have been explored, 
+        # When all candidates for a search level have been explored,
         # the contents of the beam are moved into candidateQueue, to generate next level candidates
+        members = [desc for (_, desc) in beam.get_ids()]
+        beams.append(members)
         candidateQueue = Queue()
-        candidateQueue.add_all(desc for (_, desc, _) in beam.get_values())
-        
+        candidateQueue.add_all(members)
+
+    return resultSet, beams
+
+def EMM(w, d, q, catch_all_description, df, features, target, n_chunks=5, ensure_diversity = False):
+    """
+    w - width of beam, i.e. the max number of results in the beam
+    d - num levels, i.e. how many attributes are considered
+    q - max results, i.e. max number of results output by the algorithm
+    eta - a function that receives a description and returns all possible refinements
+    satisfies_all - a function that receives a description and verifies wheather it satisfies some requirements as needed
+    eval_quality - returns a quality for a given description. This should be comparable to qualities of other descriptions
+    catch_all_description - the equivalent of True, or all, as that the whole dataset shall match
+    df - dataframe of mined dataset
+    features - features in scope
+    target - column name of target attribute in df
+    """
+
+    # Initialize variables
+    table = SelectorTable() # Interned selectors, descriptions are sorted tuples of their ids
+    columns = {f: df[f].to_numpy() for f in features} # Column arrays used to evaluate selectors without DataFrame.eval
+    target_data = df[target].to_numpy() == 1
+    counts = {} # (size, positives) counts of the evaluated descriptions
+
+    def refinements(seed):
+        return expand(seed, table, columns, target_data, features, n_chunks, counts)
+
+    def count(desc):
+        if desc not in counts:
+            mask = desc_mask(desc, table, columns, len(target_data))
+            counts[desc] = (int(mask.sum()), int(np.count_nonzero(target_data[mask])))
+        return counts[desc]
+
     # Return the <resultSet> once the BeamSearch algorithm has completed
-    return resultSet
\ No newline at end of file
+    resultSet, _ = beam_search(w, d, q, catch_all_description, table, refinements, count,
+                               len(target_data), int(np.count_nonzero(target_data)), ensure_diversity)
+    return resultSet
+
+class IncrementalEMM:
+    """
+    Used to maintain the result of EMM while new rows are appended to the dataset
+    Keeps the refinements generated by eta for the seeds of the current beams (i.e. the candidate thresholds) and the
+    (size, positives) counts of these refinements, so that appending rows only requires evaluating them on the new rows.
+    Seeds that enter a beam are expanded on all rows at that moment, and the refinements of seeds that leave all beams
+    are dropped. The thresholds of a seed thus come from the data at the time it (last) entered a beam, and the result
+    matches a full EMM run on all rows that uses these same candidate thresholds.
+    Appended rows are kept as separate batches of column arrays, which are only concatenated when a seed has to be expanded.
+    Parameters are the same as for EMM
+    """
+
+    def __init__(self, w, d, q, catch_all_description, df, features, target, n_chunks=5, ensure_diversity = False):
+        # Initializes the state and runs the search on <df>
+        self.w, self.d, self.q = w, d, q
+        self.catch_all_description = tuple(catch_all_description)
+        self.features = features
+        self.n_chunks = n_chunks
+        self.ensure_diversity = ensure_diversity
+        self.table = SelectorTable()
+        self.batches = [({f: df[f].to_numpy() for f in features}, df[target].to_numpy() == 1)] # (columns, target data) per batch of rows
+        self.n_rows = len(df)
+        self.n_positives = int(np.count_nonzero(self.batches[0][1]))
+        self.target = target
+        self.refinements = {} # seed -> list of (description, selector id) pairs generated by eta
+        self.counts = {} # description -> (size, positives)
+        self.beams = [None] * d # descriptions in the beam of every level
+        self.resultSet = self.search()
+
+    def count(self, desc):
+        # Returns the (size, positives) counts of <desc> on all rows, computing them if they are not stored
+        # The counts are summed over the batches, so no rows have to be concatenated
+        counts = self.counts.get(desc)
+        if counts is None:
+            size, positives = 0, 0
+            for columns, target_data in self.batches:
+                mask = desc_mask(desc, self.table, columns, len(target_data))
+                size += int(mask.sum())
+                positives += int(np.count_nonzero(target_data[mask]))
+            counts = self.counts[desc] = (size, positives)
+        return counts
+
+    def all_rows(self):
+        # Returns the (columns, target data) of all rows, concatenating the stored batches into a single one if needed
+        if len(self.batches) > 1:
+            columns = {f: np.concatenate([batch[0][f] for batch in self.batches]) for f in self.features}
+            target_data = np.concatenate([batch[1] for batch in self.batches])
+            self.batches = [(columns, target_data)]
+        return self.batches[0]
+
+    def refine(self, seed):
+        # Returns the stored refinements of <seed>, expanding it on all rows if it was not expanded before
+        refinements = self.refinements.get(seed)
+        if refinements is None:
+            columns, target_data = self.all_rows()
+            refinements = self.refinements[seed] = expand(seed, self.table, columns, target_data,
+                                                          self.features, self.n_chunks, self.counts)
+        return refinements
+
+    def seeds(self):
+        # Returns the seeds expanded by the current beams
+        return [self.catch_all_description] + [desc for beam in self.beams[:-1] for desc in beam]
+
+    def search(self):
+        # Runs the BeamSearch on the stored refinements and counts, then drops the state of seeds that left all beams
+        resultSet, beams = beam_search(self.w, self.d, self.q, self.catch_all_description, self.table,
+                                       self.refine, self.count, self.n_rows, self.n_positives, self.ensure_diversity)
+        for level, members in enumerate(beams):
+            if self.beams[level] is not None and set(members) != set(self.beams[level]):
+                print("level : ", level, " beam changed")
+        self.beams = beams
+        seeds = self.seeds()
+        self.refinements = {seed: self.refinements[seed] for seed in seeds if seed in self.refinements}
+        self.counts = {desc: self.counts[desc] for seed in seeds for desc, _ in self.refinements.get(seed, [])
+                       if desc in self.counts}
+        return resultSet
+
+    def append(self, df):
+        # Adds the rows of <df> to the dataset, updates the counts using only these rows and returns the new result set
+        columns = {f: df[f].to_numpy() for f in self.features}
+        target_data = df[self.target].to_numpy() == 1
+        counts = {}
+        for seed in self.seeds():
+            seed_mask = desc_mask(seed, self.table, columns, len(df))
+            for desc, sid in self.refinements.get(seed, []):
+                if desc not in counts and desc in self.counts:
+                    mask = seed_mask & self.table.mask(sid, columns)
+                    size, positives = self.counts[desc]
+                    counts[desc] = (size + int(mask.sum()), positives + int(np.count_nonzero(target_data[mask])))
+        self.counts = counts
+        self.batches.append((columns, target_data))
+        self.n_rows += len(df)
+        self.n_positives += int(np.count_nonzero(target_data))
+        self.resultSet = self.search()
+        return self.resultSet
+
+def save_results(resultSet, path):
+    # Function used to store the <resultSet> returned by EMM in a compact binary (.npz) file
+    table = resultSet.table
+    if table is None:
+        raise ValueError("Only result sets of selector id descriptions (with a SelectorTable) can be saved")
+    entries = list(resultSet.get_ids())
+    descs = [desc for (_, desc) in entries]
+    np.savez_compressed(path,
+        features = np.array(table.features, dtype=str),
+        num_values = np.array(table.num_values, dtype=np.float64),
+        cat_values = np.array([str(v) for v in table.cat_values], dtype=str),
+        selectors = np.array(table.selectors, dtype=np.int32).reshape(-1, 3),
+        qualities = np.array([q for (q, _) in entries], dtype=np.float64),
+        desc_lengths = np.array([len(desc) for desc in descs], dtype=np.int32),
+        desc_ids = np.array([sid for desc in descs for sid in desc], dtype=np.int32))
+
+def load_results(path):
+    # Function used to load a result set stored by save_results
+    # Categorical values are restored as strings
+    with np.load(path) as data:
+        table = SelectorTable()
+        table.features = data['features'].tolist()
+        table.num_values = data['num_values'].tolist()
+        table.cat_values = data['cat_values'].tolist()
+        table.selectors = [tuple(s) for s in data['selectors'].tolist()]
+        table.feature_ids = {f: i for i, f in enumerate(table.features)}
+        table.num_ids = {v: i for i, v in enumerate(table.num_values)}
+        table.cat_ids = {(fid, str, table.cat_values[vid]): vid for (fid, op, vid) in table.selectors if op >= 2}
+        table.selector_ids = {s: i for i, s in enumerate(table.selectors)}
+        resultSet = BoundedPriorityQueue(len(data['qualities']), table)
+        ids = np.split(data['desc_ids'], np.cumsum(data['desc_lengths'])[:-1])
+        for quality, desc in reversed(list(zip(data['qualities'].tolist(), ids))):
+            resultSet.add(tuple(desc.tolist()), quality)
+    return resultSet
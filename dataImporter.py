@@ -2,7 +2,12 @@
 import pandas as pd
 
 # Function used to import a specified dataset
-def getData(dataset) :
+def getData(dataset, scaler = None) :
+    """
+    dataset: Name of the dataset to import
+    scaler: Optional Standardizer applied in place to the numerical columns (by default all of <num>),
+            it is fitted on the dataset first unless it has already been fitted
+    """
     
     # Initializations
     dictio = {}
@@ -82,8 +87,10 @@ def getData(dataset) :
         
     # Indoor dataset
     elif dataset == "Indoor" :
-        df = pd.read_csv('data/Indoor1.csv', sep=",", na_values = ['na'])
-        df2 = pd.read_csv('data/Indoor2.csv', sep=",", na_values = ['na'])
+        # Read the WAP columns as floats, so that a Standardizer (here or in the pipeline) can overwrite them in place
+        dtypes = {'WAP{:03d}'.format(i): 'float64' for i in range(1, 521)}
+        df = pd.read_csv('data/Indoor1.csv', sep=",", na_values = ['na'], dtype=dtypes)
+        df2 = pd.read_csv('data/Indoor2.csv', sep=",", na_values = ['na'], dtype=dtypes)
         df = pd.concat([df, df2])
         df['target'] = [1 if x == 2 else 0 for x in df['BUILDINGID']]
         df = df.drop(['LONGITUDE','LATITUDE','FLOOR', 'SPACEID', 'RELATIVEPOSITION', 'TIMESTAMP', 'BUILDINGID'], axis=1)
@@ -94,6 +101,14 @@ def getData(dataset) :
         df = df.reset_index()
         df = df.drop(columns=['index'])
     
+    # Standardize the numerical columns in place, without copying the dataset
+    if scaler is not None :
+        if scaler.columns is None :
+            scaler.columns = num
+        if scaler.mean is None :
+            scaler.fit(df)
+        scaler.transform(df, inplace=True)
+    
     # Return the dataset <df>, a list of categorical features <cat>,
     # a list of numerical features <num> and a total set of features
     features = num+cat
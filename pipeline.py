@@ -0,0 +1,199 @@
+# Package imports
+import hashlib
+import itertools
+import json
+import os
+import pickle
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+# Data files read by getData for each dataset, hashed so that changes to the raw data invalidate the cache
+dataFiles = {
+    "Ionosphere": ['data/ionosphere.data'],
+    "Mushroom": ['data/Mushroom.data'],
+    "Adult": ['data/adult.data', 'data/adult.test'],
+    "Soybean": ['data/soybean-large.data'],
+    "Arrhythmia": ['data/arrhythmia.data'],
+    "Indoor": ['data/Indoor1.csv', 'data/Indoor2.csv'],
+}
+
+# Source files of the code run by every stage, their content is part of the cache keys
+# so that artifacts computed by older code are never reused
+stageModules = {
+    "data": ['pipeline.py', 'dataImporter.py', 'utilityFunctions.py'],
+    "standardize": ['pipeline.py', 'utilityFunctions.py'],
+    "encode": ['pipeline.py', 'autoEncoder.py', 'utilityFunctions.py'],
+    "mine": ['pipeline.py', 'beamSearch.py', 'adjPysubgroup.py', 'stdPysubgroup.py'],
+}
+
+# Function used to build a grid of jobs from lists of options
+def jobGrid(datasets, encoders = [None], algorithms = [("EMM", {})], standardize = [False]) :
+    """
+    datasets: List of dataset names accepted by getData
+    encoders: List of autoEncode keyword arguments (dicts), None means mining is done on the original features
+    algorithms: List of (algorithm name, parameter dict) pairs, see runAlgorithm for the supported names
+    standardize: List of booleans indicating whether the numerical columns are standardized before encoding/mining
+    """
+    jobs = []
+    for dataset, std, encoder, (algorithm, params) in itertools.product(datasets, standardize, encoders, algorithms) :
+        jobs.append({'dataset': dataset, 'standardize': std, 'encoder': encoder,
+                     'algorithm': algorithm, 'params': params})
+    return jobs
+
+# Function used to compute the cache key of a stage from its name, source code, parameters and upstream key
+def hashKey(stage, params, upstream = None) :
+    code = hashPaths([os.path.join(os.path.dirname(os.path.abspath(__file__)), module) for module in stageModules[stage]])
+    content = json.dumps([stage, code, params, upstream], sort_keys=True, default=str)
+    return stage + "-" + hashlib.sha256(content.encode()).hexdigest()[:24]
+
+# Function used to hash the content of a list of files, raises FileNotFoundError if one of them is missing
+def hashPaths(paths) :
+    sha = hashlib.sha256()
+    for path in paths :
+        if not os.path.exists(path) :
+            raise FileNotFoundError("File not found: {}".format(path))
+        with open(path, 'rb') as f :
+            for block in iter(lambda: f.read(1 << 20), b'') :
+                sha.update(block)
+    return sha.hexdigest()
+
+# Function used to hash the raw data files of a dataset
+def hashFiles(dataset) :
+    if dataset not in dataFiles :
+        raise ValueError("Unknown dataset: {}".format(dataset))
+    return hashPaths(dataFiles[dataset])
+
+# Functions used to read and write cached artifacts
+def artifactPath(key, cacheDir = 'cache') :
+    return os.path.join(cacheDir, key + '.pkl')
+
+def loadArtifact(key, cacheDir = 'cache') :
+    with open(artifactPath(key, cacheDir), 'rb') as f :
+        return pickle.load(f)
+
+def storeArtifact(artifact, key, cacheDir = 'cache') :
+    # Write to a temporary file first so that an interrupted run never leaves a partial artifact behind
+    path = artifactPath(key, cacheDir)
+    tmpPath = path + '.{}.tmp'.format(os.getpid())
+    with open(tmpPath, 'wb') as f :
+        pickle.dump(artifact, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmpPath, path)
+
+# Function used to check the parameters of an algorithm
+# The pysubgroup algorithms use fixed settings, so they do not accept parameters
+def checkParams(algorithm, params) :
+    if algorithm not in ["EMM", "BestFirstSearch", "DFS", "Apriori"] :
+        raise ValueError("Unknown algorithm: {}".format(algorithm))
+    if algorithm != "EMM" and params :
+        raise ValueError("Algorithm {} does not accept parameters, got {}".format(algorithm, params))
+
+# Function used to run one of the supported subgroup discovery algorithms on a frame artifact
+def runAlgorithm(algorithm, frame, params) :
+    checkParams(algorithm, params)
+    if algorithm == "EMM" :
+        from beamSearch import EMM
+        params = dict({'w': 100, 'd': 3, 'q': 100, 'ensure_diversity': True}, **params)
+        output = EMM(params.pop('w'), params.pop('d'), params.pop('q'), [], frame['df'],
+                     frame['features'], 'target', **params)
+        return [i for i in output.get_values()]
+    elif algorithm == "BestFirstSearch" :
+        from adjPysubgroup import adjustedBestFirstSearch
+        return adjustedBestFirstSearch(frame['df'])
+    elif algorithm == "DFS" :
+        from adjPysubgroup import adjustedDFS
+        return adjustedDFS(frame['df'])
+    elif algorithm == "Apriori" :
+        from adjPysubgroup import adjustedApriori
+        return adjustedApriori(frame['df'])
+
+# Function used to compute a single stage, executed by the worker pool
+def runStage(stage, params, upstream, key, cacheDir) :
+    if stage == "data" :
+        from dataImporter import getData
+        df, cat, num, features = getData(params['dataset'])
+        artifact = {'df': df, 'cat': cat, 'num': num, 'features': features}
+    elif stage == "standardize" :
+        from utilityFunctions import Standardizer
+        artifact = loadArtifact(upstream, cacheDir)
+        scaler = Standardizer([col for col in artifact['num'] if col != 'target']).fit(artifact['df'])
+        scaler.transform(artifact['df'], inplace=True)
+        artifact['scaler'] = scaler
+    elif stage == "encode" :
+        from autoEncoder import autoEncode
+        frame = loadArtifact(upstream, cacheDir)
+        df_en, mse = autoEncode(frame['df'], frame['cat'], frame['num'], **params)
+        features_en = [i for i in df_en.columns if 'cat' in i]
+        artifact = {'df': df_en, 'cat': [], 'num': features_en, 'features': features_en, 'mse': mse}
+    else :
+        frame = loadArtifact(upstream, cacheDir)
+        artifact = runAlgorithm(params['algorithm'], frame, params['params'])
+    storeArtifact(artifact, key, cacheDir)
+    return key
+
+# Function used to run a grid of jobs with caching and a local worker pool
+def runPipeline(jobs, cacheDir = 'cache', nWorkers = None, verbose = True) :
+    """
+    jobs: List of job dicts with keys 'dataset', 'standardize', 'encoder', 'algorithm' and 'params' (see jobGrid)
+    cacheDir: Directory in which every intermediate artifact is stored under the hash of its inputs
+    nWorkers: Number of worker processes (None = number of CPUs, 1 = run in the current process)
+    verbose: Print which stages are computed and which are taken from the cache
+    """
+
+    # Initializations
+    os.makedirs(cacheDir, exist_ok=True)
+    stages = {} # maps key -> (stage, params, upstream), every stage is inserted after its upstream stage
+    jobKeys = []
+
+    # Derive the chain of stage keys for every job, shared stages end up with identical keys
+    # Unknown datasets, missing data files and invalid parameters raise an error before anything is computed
+    for job in jobs :
+        checkParams(job['algorithm'], job.get('params', {}))
+        params = {'dataset': job['dataset']}
+        key = hashKey("data", dict(params, files=hashFiles(job['dataset'])))
+        stages[key] = ("data", params, None)
+        frameKey = key
+        if job.get('standardize', False) :
+            key = hashKey("standardize", {}, frameKey)
+            stages[key] = ("standardize", {}, frameKey)
+            frameKey = key
+        if job.get('encoder') is not None :
+            key = hashKey("encode", job['encoder'], frameKey)
+            stages[key] = ("encode", job['encoder'], frameKey)
+            frameKey = key
+        params = {'algorithm': job['algorithm'], 'params': job.get('params', {})}
+        key = hashKey("mine", params, frameKey)
+        stages[key] = ("mine", params, frameKey)
+        jobKeys.append((frameKey, key))
+
+    # Determine which stages are missing from the cache
+    done = set(key for key in stages if os.path.exists(artifactPath(key, cacheDir)))
+    pending = [key for key in stages if key not in done]
+    if verbose :
+        for key in stages :
+            print("cached  : " if key in done else "compute : ", key)
+
+    # Compute every missing stage, a stage is submitted to the pool as soon as its upstream stage is available
+    if nWorkers == 1 :
+        for key in pending :
+            runStage(*stages[key], key, cacheDir)
+        return collectResults(jobs, jobKeys, cacheDir)
+    executor = ProcessPoolExecutor(nWorkers)
+    try :
+        running = {}
+        while pending or running :
+            for key in [key for key in pending if stages[key][2] is None or stages[key][2] in done] :
+                pending.remove(key)
+                running[executor.submit(runStage, *stages[key], key, cacheDir)] = key
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished :
+                done.add(future.result())
+                del running[future]
+    finally :
+        executor.shutdown(cancel_futures=True)
+    return collectResults(jobs, jobKeys, cacheDir)
+
+# Function used to load the result of every job, together with the key of the frame it was mined on
+def collectResults(jobs, jobKeys, cacheDir = 'cache') :
+    results = []
+    for job, (frameKey, key) in zip(jobs, jobKeys) :
+        results.append({'job': job, 'frameKey': frameKey, 'result': loadArtifact(key, cacheDir)})
+    return results
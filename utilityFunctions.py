@@ -1,14 +1,136 @@
+# Package imports
+import numpy as np
+
+# Class used to standardize numerical variables with fitted parameters
+# The statistics are computed in chunks (merged with Welford/Chan updates), so the data never has to be copied as a whole
+class Standardizer :
+    """
+    columns: List containing the numerical column names to standardize (None = all columns of the first fitted chunk)
+    chunkBytes: Size (in bytes) of the float64 chunks processed at once, the number of rows/columns per chunk is derived from it
+    """
+
+    def __init__(self, columns = None, chunkBytes = 2**22) :
+        # Initializes an unfitted standardizer
+        self.columns = None if columns is None else list(columns)
+        self.chunkBytes = chunkBytes
+        self.count = None
+        self.mean = None
+        self.m2 = None
+
+    def chunkRows(self, nColumns) :
+        # Number of rows of <nColumns> float64 values that fit in <chunkBytes>
+        return max(1, self.chunkBytes // (8 * max(nColumns, 1)))
+
+    def partialFit(self, chunk) :
+        # Updates the running statistics with <chunk>, a DataFrame or a 2D array whose columns follow <self.columns>
+        # Missing values are ignored, like in pandas' mean/std
+        if hasattr(chunk, 'columns') :
+            if self.columns is None :
+                self.columns = list(chunk.columns)
+            chunk = chunk[self.columns]
+        x = np.asarray(chunk, dtype=np.float64)
+        if x.ndim == 1 :
+            x = x.reshape(-1, 1)
+        observed = ~np.isnan(x)
+        countB = observed.sum(axis=0)
+        meanB = np.where(observed, x, 0).sum(axis=0) / np.maximum(countB, 1)
+        m2B = np.where(observed, (x - meanB)**2, 0).sum(axis=0)
+        if self.count is None :
+            self.count, self.mean, self.m2 = countB, meanB, m2B
+        else :
+            total = self.count + countB
+            delta = meanB - self.mean
+            self.mean = self.mean + delta * countB / np.maximum(total, 1)
+            self.m2 = self.m2 + m2B + delta**2 * self.count * countB / np.maximum(total, 1)
+            self.count = total
+        return self
+
+    def fit(self, data) :
+        # Computes the statistics of <data>, which can be a DataFrame, a (memory-mapped) 2D array or an iterable of chunks
+        # (e.g. pd.read_csv(..., chunksize=...)), in a single pass
+        self.count = self.mean = self.m2 = None
+        if hasattr(data, 'columns') :
+            if self.columns is None :
+                self.columns = list(data.columns)
+            rows = self.chunkRows(len(self.columns))
+            for start in range(0, len(data), rows) :
+                self.partialFit(data.iloc[start:start+rows])
+        elif hasattr(data, 'shape') :
+            rows = self.chunkRows(data.shape[1] if len(data.shape) > 1 else 1)
+            for start in range(0, len(data), rows) :
+                self.partialFit(data[start:start+rows])
+        else :
+            for chunk in data :
+                self.partialFit(chunk)
+        return self
+
+    @property
+    def std(self) :
+        # Sample standard deviation (ddof=1), constant or empty columns get a standard deviation of 1 so they are only centered
+        std = np.sqrt(self.m2 / np.maximum(self.count - 1, 1))
+        return np.where((std > 0) & (self.count > 1), std, 1.0)
+
+    def apply(self, df, func) :
+        # Replaces the values of the fitted columns of DataFrame <df> by func(values, columnSlice), in batches of columns
+        # Float64 columns are written into their existing storage, other columns are replaced by new float64 columns
+        positions = df.columns.get_indexer(self.columns)
+        if (positions < 0).any() :
+            raise KeyError("Columns not in DataFrame: {}".format([c for c, p in zip(self.columns, positions) if p < 0]))
+        batch = max(1, self.chunkBytes // (8 * max(len(df), 1)))
+        for start in range(0, len(positions), batch) :
+            pos = positions[start:start+batch]
+            values = func(df.iloc[:, pos].to_numpy(dtype=np.float64), slice(start, start+batch))
+            isFloat = (df.dtypes.iloc[pos] == np.float64).to_numpy()
+            if isFloat.any() :
+                df.iloc[:, pos[isFloat]] = values[:, isFloat]
+            for j in np.flatnonzero(~isFloat) :
+                df[df.columns[pos[j]]] = values[:, j]
+        return df
+
+    def transform(self, df, inplace = False) :
+        # Applies the fitted parameters to the numerical columns of DataFrame <df>
+        # With <inplace> float64 columns are overwritten batch by batch, so the frame is not duplicated
+        std = self.std
+        if not inplace :
+            df = df.copy()
+        return self.apply(df, lambda values, s : (values - self.mean[s]) / std[s])
+
+    def transformArray(self, x, columns = None) :
+        # Applies the fitted parameters in place to the float 2D array <x> (e.g. a memory-map), in batches of rows
+        # <columns> names the columns of <x> when they do not follow <self.columns>
+        mean, std = self.mean, self.std
+        if columns is not None :
+            missing = [col for col in columns if col not in self.columns]
+            if missing :
+                raise ValueError("Standardizer was not fitted on columns: {}".format(missing))
+            index = [self.columns.index(col) for col in columns]
+            mean, std = mean[index], std[index]
+        rows = self.chunkRows(x.shape[1])
+        for start in range(0, len(x), rows) :
+            batch = x[start:start+rows]
+            batch -= mean
+            batch /= std
+        return x
+
+    def transformBatches(self, chunks) :
+        # Returns a generator that standardizes an iterable of DataFrame chunks, one chunk at a time
+        for chunk in chunks :
+            yield self.transform(chunk, inplace=True)
+
+    def inverseTransform(self, df, inplace = False) :
+        # Maps standardized columns of DataFrame <df> back to their original scale
+        std = self.std
+        if not inplace :
+            df = df.copy()
+        return self.apply(df, lambda values, s : values * std[s] + self.mean[s])
+
 # Function to standardize numerical variables
 # Used for the arrhythmia and adult datasets
-def standardize(df, num) :
+def standardize(df, num, inplace = False) :
     """
     df: DataFrame of the dataset
     num: List containing numerical column names
+    inplace: Overwrite the columns of <df> instead of returning a new DataFrame
     """
-    df_std = df.copy()
-    for col in num :
-        if col != 'target' :
-            mean = df_std[col].mean()
-            std = df_std[col].std()
-            df_std[col] = (df_std[col]-mean)/std
-    return df_std
\ No newline at end of file
+    scaler = Standardizer([col for col in num if col != 'target']).fit(df)
+    return scaler.transform(df, inplace=inplace)